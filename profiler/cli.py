@@ -1,52 +1,245 @@
 from __future__ import annotations
 
 import argparse
-from pathlib import Path
+import signal
+import sys
+from typing import List, Optional
 
-from profiler.config import Config, OutliersConfig
+from profiler.config import Config, DependenciesConfig, OutliersConfig, PatternsConfig, ServiceConfig
 from profiler.profiling.profiler import Profiler
-from profiler.reporting.exporters import Exporters
+from profiler.reporting.checkpoint import OUTPUT_FORMATS
+from profiler.reporting.history import HistoryStore
+from profiler.service import ProfilingService
 
 
-def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Run data profiling against supported databases.")
+def build_parser(
+    prog: Optional[str] = None,
+    description: str = "Run data profiling against supported databases.",
+    resumable: bool = True,
+) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog=prog, description=description)
     parser.add_argument("--engine", required=True, help="Database engine (sqlserver | oracle).")
     parser.add_argument("--connstr", required=True, help="Connection string for the target database.")
     parser.add_argument("--targets-file", required=True, help="Path to targets JSON file.")
     parser.add_argument("--sample-rows", type=int, default=10000, help="Sample rows per target (default: 10000).")
+    parser.add_argument(
+        "--shared-scans",
+        action="store_true",
+        help=(
+            "Read filtered table targets on the same table with one shared scan. Pays off when the filters "
+            "select similar row counts; a dominant filter makes the others be fetched twice."
+        ),
+    )
+    parser.add_argument(
+        "--prefetch-depth",
+        type=int,
+        default=2,
+        help="Targets fetched ahead while the current one is profiled; 0 disables prefetching (default: 2).",
+    )
+    parser.add_argument(
+        "--prefetch-max-mb",
+        type=float,
+        default=512,
+        help=(
+            "Memory ceiling in MB for prefetched data (default: 512). Peak memory is this ceiling plus one "
+            "target being fetched plus one being profiled."
+        ),
+    )
     parser.add_argument("--outdir", default=".", help="Output directory for exported profiles.")
+    parser.add_argument(
+        "--output-format",
+        choices=sorted(OUTPUT_FORMATS),
+        default="csv",
+        help="Format of the per-target output files (default: csv).",
+    )
+    if resumable:
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip targets already completed according to the run manifest in --outdir.",
+        )
     parser.add_argument(
         "--outliers-method",
         choices=["iqr", "zscore", "both"],
         help="Outlier detection method override (iqr | zscore | both).",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--no-string-patterns",
+        action="store_true",
+        help="Skip string shape patterns and format ratios.",
+    )
+    parser.add_argument(
+        "--dependency-width",
+        type=int,
+        default=0,
+        help=(
+            "Max columns per candidate key / functional dependency; enables the analysis, which can take "
+            "up to --dependency-budget seconds per target (default: 0, disabled)."
+        ),
+    )
+    parser.add_argument(
+        "--dependency-budget",
+        type=float,
+        default=10.0,
+        help="Time budget in seconds for dependency discovery per target (default: 10).",
+    )
+    parser.add_argument("--history-db", help="SQLite history store to append this run's profiles to.")
+    return parser
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    return build_parser().parse_args(argv)
+
+
+def parse_serve_args(argv: List[str]) -> argparse.Namespace:
+    # Every job writes to its own folder, so there is never a run to resume.
+    parser = build_parser(
+        prog="profiler serve",
+        description="Run the profiler as a long-lived service.",
+        resumable=False,
+    )
+    parser.set_defaults(outdir=None, resume=False)
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP bind address (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8765, help="HTTP port (default: 8765).")
+    parser.add_argument("--socket", help="Serve on this Unix socket path instead of TCP.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Worker threads, each with a warm connection (default: 2).",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=16,
+        help="Max queued jobs before rejecting requests (default: 16).",
+    )
+    parser.add_argument(
+        "--default-interval",
+        type=float,
+        help="Schedule interval in seconds for targets without 'interval_seconds'; omit for on-demand only.",
+    )
+    return parser.parse_args(argv)
+
+
+def parse_history_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="profiler history", description="Query the profile history store.")
+    parser.add_argument("--db", required=True, help="Path to the SQLite history store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("runs", help="List recorded runs.")
+
+    series = commands.add_parser("series", help="Time series of one metric.")
+    series.add_argument("--target", required=True, help="Target name.")
+    series.add_argument("--metric", required=True, help="Metric name (e.g. null_ratio).")
+    series.add_argument("--column", help="Column name; omit for table-level metrics.")
+    series.add_argument("--kind", choices=["table", "column", "outlier"], help="Profile kind override.")
+    series.add_argument("--since", help="Only runs at or after this ISO timestamp.")
+
+    compare = commands.add_parser("compare", help="Compare column profiles of two runs.")
+    compare.add_argument("run_a", help="Baseline run id.")
+    compare.add_argument("run_b", help="Run id to compare against the baseline.")
+    compare.add_argument(
+        "--null-ratio-jump",
+        type=float,
+        default=0.1,
+        help="Null ratio increase to flag (default: 0.1).",
+    )
+    compare.add_argument(
+        "--distinct-collapse",
+        type=float,
+        default=0.5,
+        help="Flag when distinct count falls to this fraction of the baseline (default: 0.5).",
+    )
+    compare.add_argument("--flagged-only", action="store_true", help="Only print flagged columns.")
+    return parser.parse_args(argv)
 
 
-def main() -> None:
-    args = parse_args()
+def history_main(argv: List[str]) -> None:
+    args = parse_history_args(argv)
+    with HistoryStore(args.db) as store:
+        if args.command == "runs":
+            df = store.list_runs()
+        elif args.command == "series":
+            df = store.metric_series(
+                args.target,
+                args.metric,
+                column_name=args.column,
+                kind=args.kind,
+                since=args.since,
+            )
+        else:
+            df = store.compare_runs(
+                args.run_a,
+                args.run_b,
+                null_ratio_jump=args.null_ratio_jump,
+                distinct_collapse=args.distinct_collapse,
+            )
+            if args.flagged_only:
+                df = df[df["null_ratio_jump"] | df["distinct_collapse"]]
+    print(df.to_string(index=False))
 
+
+def config_from_args(args: argparse.Namespace) -> Config:
     outliers_config = OutliersConfig()
     if args.outliers_method:
         outliers_config.method = args.outliers_method
 
-    config = Config(
+    dependencies_config = DependenciesConfig(
+        enabled=args.dependency_width > 0,
+        max_width=max(args.dependency_width, 1),
+        time_budget_seconds=args.dependency_budget,
+    )
+
+    return Config(
         engine=args.engine,
         connection_string=args.connstr,
         targets_file=args.targets_file,
         sample_rows=args.sample_rows,
+        shared_scans=args.shared_scans,
+        prefetch_depth=max(args.prefetch_depth, 0),
+        prefetch_max_bytes=int(args.prefetch_max_mb * 1024 * 1024),
         outdir=args.outdir,
+        output_format=args.output_format,
+        resume=args.resume,
+        history_db=args.history_db,
         outliers=outliers_config,
+        patterns=PatternsConfig(enabled=not args.no_string_patterns),
+        dependencies=dependencies_config,
+    )
+
+
+def serve_main(argv: List[str]) -> None:
+    args = parse_serve_args(argv)
+    service_config = ServiceConfig(
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        default_interval_seconds=args.default_interval,
     )
 
-    profiler = Profiler(config)
-    results = profiler.run()
+    def _terminate(signum: int, frame: object) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+    ProfilingService(config_from_args(args), service_config).serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "history":
+        history_main(argv[1:])
+        return
+    if argv and argv[0] == "serve":
+        serve_main(argv[1:])
+        return
+
+    config = config_from_args(parse_args(argv))
 
-    outdir = Path(config.outdir or ".")
-    Exporters.export_to_csv(results.table_profile, outdir / "table_profile.csv")
-    Exporters.export_to_csv(results.column_profile, outdir / "column_profile.csv")
-    if not results.outliers.empty:
-        Exporters.export_to_csv(results.outliers, outdir / "outliers.csv")
+    # Results are written to --outdir target by target while the run progresses.
+    Profiler(config).run()
 
 
 if __name__ == "__main__":
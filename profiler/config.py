@@ -8,12 +8,44 @@ class OutliersConfig:
     zscore_threshold: float = 3.0
     iqr_factor: float = 1.5
 
+@dataclass
+class PatternsConfig:
+    enabled: bool = True
+    max_patterns: int = 20
+    max_length: int = 64
+
+@dataclass
+class DependenciesConfig:
+    # Opt-in: the search costs seconds per target on wide samples, far more than the other metrics.
+    enabled: bool = False
+    max_width: int = 2
+    time_budget_seconds: float = 10.0
+
 @dataclass
 class Config:
     engine: str
     connection_string: str
     targets_file: Optional[str] = None
     sample_rows: int = 10000
+    # Opt-in: a shared scan under-fills skewed filters, which are then fetched again on their own.
+    shared_scans: bool = False
+    prefetch_depth: int = 2
+    prefetch_max_bytes: Optional[int] = 512 * 1024 * 1024
     outdir: Optional[str] = None
+    output_format: str = "csv"
+    resume: bool = False
+    history_db: Optional[str] = None
     outliers: OutliersConfig = field(default_factory=OutliersConfig)
+    patterns: PatternsConfig = field(default_factory=PatternsConfig)
+    dependencies: DependenciesConfig = field(default_factory=DependenciesConfig)
     extra: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class ServiceConfig:
+    host: str = "127.0.0.1"
+    port: int = 8765
+    socket_path: Optional[str] = None
+    workers: int = 2
+    queue_size: int = 16
+    default_interval_seconds: Optional[float] = None
+    max_finished_jobs: int = 1000
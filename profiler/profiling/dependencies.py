@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass
+from itertools import combinations
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from profiler.config import DependenciesConfig
+
+
+# Densify through a bincount when the code space is at most this many times the row count.
+_DENSE_BINCOUNT_FACTOR = 4
+_PROBE_ROWS = 4096
+
+
+@dataclass
+class DependencyResult:
+    target_name: str
+    kind: str
+    lhs: str
+    rhs: Optional[str]
+    width: int
+    search_complete: bool
+
+
+class DependencyAnalyzer:
+    """
+    Candidate key and functional dependency discovery over the sample frame.
+
+    Every column is hashed once into dense integer codes (nulls count as one
+    more value). Column combinations are tested by folding their codes into a
+    single int64 key and counting distinct keys, so `X` is a key when it has
+    as many distinct values as rows, and `X -> Y` holds when adding `Y` does
+    not increase the distinct count of `X`. Combinations with a NULL in any
+    column are never reported as candidate keys. Only minimal results are
+    reported, and since the search runs on a sample, they are candidates,
+    not guarantees.
+    """
+
+    def __init__(self, config: DependenciesConfig) -> None:
+        self.config = config
+
+    def detect(self, df: pd.DataFrame, target_name: str) -> pd.DataFrame:
+        columns = list(DependencyResult.__annotations__.keys())
+        if not self.config.enabled or df.empty or df.shape[1] == 0:
+            return pd.DataFrame(columns=columns)
+
+        deadline = time.perf_counter() + float(self.config.time_budget_seconds)
+        search = _DependencySearch(df, deadline)
+        results = search.run(max(1, int(self.config.max_width)))
+
+        rows = [
+            asdict(
+                DependencyResult(
+                    target_name=target_name,
+                    kind=kind,
+                    lhs=", ".join(str(col) for col in lhs),
+                    rhs=None if rhs is None else str(rhs),
+                    width=len(lhs),
+                    search_complete=search.complete,
+                )
+            )
+            for kind, lhs, rhs in results
+        ]
+        return pd.DataFrame(rows, columns=columns)
+
+
+class _DependencySearch:
+    def __init__(self, df: pd.DataFrame, deadline: float) -> None:
+        self.row_count = len(df)
+        self.deadline = deadline
+        self.complete = True
+        self.columns: List[object] = list(df.columns)
+        self.codes: Dict[object, np.ndarray] = {}
+        self.cardinality: Dict[object, int] = {}
+        self.nullable: Dict[object, bool] = {}
+        for col in self.columns:
+            self.codes[col], self.cardinality[col], self.nullable[col] = _encode(df[col])
+
+    def run(self, max_width: int) -> List[Tuple[str, Tuple[object, ...], Optional[object]]]:
+        n = self.row_count
+        results: List[Tuple[str, Tuple[object, ...], Optional[object]]] = []
+        keys: List[FrozenSet[object]] = []
+        determinants: Dict[object, List[FrozenSet[object]]] = {col: [] for col in self.columns}
+
+        for col in self.columns:
+            if self.cardinality[col] == n and not self.nullable[col]:
+                keys.append(frozenset([col]))
+                results.append(("candidate_key", (col,), None))
+
+        # Constant columns are determined by anything and unique columns determine everything: neither is
+        # informative. A unique column holding a NULL is not a key, but it still determines everything.
+        informative = [col for col in self.columns if 1 < self.cardinality[col] < n]
+
+        for width in range(1, max_width + 1):
+            for lhs in combinations(informative, width):
+                lhs_set = frozenset(lhs)
+                if any(key <= lhs_set for key in keys) or self._has_redundant_member(lhs_set, determinants):
+                    continue
+                if self._out_of_time():
+                    return results
+
+                lhs_codes, lhs_distinct = self._distinct_codes(lhs)
+                if width > 1 and lhs_distinct == n:
+                    if not any(self.nullable[col] for col in lhs):
+                        keys.append(lhs_set)
+                        results.append(("candidate_key", lhs, None))
+                    continue
+
+                for rhs in informative:
+                    if rhs in lhs_set or self.cardinality[rhs] > lhs_distinct:
+                        continue
+                    if any(prior <= lhs_set for prior in determinants[rhs]):
+                        continue
+                    if self._out_of_time():
+                        return results
+                    if _determines(lhs_codes, lhs_distinct, self.codes[rhs]):
+                        determinants[rhs].append(lhs_set)
+                        results.append(("functional_dependency", lhs, rhs))
+
+        return results
+
+    def _distinct_codes(self, columns: Sequence[object]) -> Tuple[np.ndarray, int]:
+        codes = self.codes[columns[0]]
+        cardinality = self.cardinality[columns[0]]
+        # Codes stay dense after every fold, so `left * right_cardinality + right` is bounded by rows**2.
+        for col in columns[1:]:
+            codes = codes * self.cardinality[col] + self.codes[col]
+            codes, cardinality = _densify(codes, cardinality * self.cardinality[col])
+        return codes, cardinality
+
+    @staticmethod
+    def _has_redundant_member(lhs: FrozenSet[object], determinants: Dict[object, List[FrozenSet[object]]]) -> bool:
+        # A combination containing a column already determined by the rest adds nothing over the smaller one.
+        return any(any(prior <= lhs - {col} for prior in determinants[col]) for col in lhs)
+
+    def _out_of_time(self) -> bool:
+        if time.perf_counter() > self.deadline:
+            self.complete = False
+        return not self.complete
+
+
+def _encode(series: pd.Series) -> Tuple[np.ndarray, int, bool]:
+    try:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    except TypeError:
+        # Unhashable values (lists, dicts) fall back to their string representation.
+        codes, uniques = pd.factorize(series.astype(str).where(series.notna()), use_na_sentinel=True)
+    codes = codes.astype(np.int64, copy=False)
+    cardinality = len(uniques)
+    missing = codes < 0
+    nullable = bool(missing.any())
+    if nullable:
+        codes[missing] = cardinality
+        cardinality += 1
+    return codes, cardinality, nullable
+
+
+def _densify(codes: np.ndarray, bound: int) -> Tuple[np.ndarray, int]:
+    """Renumber codes in `[0, bound)` to `[0, distinct)`."""
+    if bound <= max(_DENSE_BINCOUNT_FACTOR * len(codes), 1 << 16):
+        present = np.bincount(codes, minlength=bound) > 0
+        remap = np.cumsum(present) - 1
+        return remap[codes], int(remap[-1]) + 1 if len(remap) else 0
+    dense, uniques = pd.factorize(codes)
+    return dense.astype(np.int64, copy=False), len(uniques)
+
+
+def _determines(lhs_codes: np.ndarray, lhs_cardinality: int, rhs_codes: np.ndarray) -> bool:
+    """True when every dense `lhs` code maps to a single `rhs` code."""
+    # Scatter one rhs value per lhs group, gather it back and compare; most
+    # non-dependencies are rejected on the probe prefix without a full pass.
+    for stop in (min(len(lhs_codes), _PROBE_ROWS), len(lhs_codes)):
+        lhs, rhs = lhs_codes[:stop], rhs_codes[:stop]
+        representative = np.empty(lhs_cardinality, dtype=np.int64)
+        representative[lhs] = rhs
+        if not np.array_equal(representative[lhs], rhs):
+            return False
+    return True
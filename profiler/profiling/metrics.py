@@ -11,8 +11,40 @@ from pandas.api.types import (
     is_string_dtype,
 )
 
+from profiler.profiling.patterns import FORMAT_PATTERNS, format_ratios, require_arrow_strings, to_string_series
+
+
+COLUMN_PROFILE_COLUMNS: List[str] = [
+    "target_name",
+    "column_name",
+    "total_rows",
+    "null_count",
+    "null_ratio",
+    "distinct_count",
+    "distinct_ratio",
+    "min",
+    "max",
+    "mean",
+    "median",
+    "std_dev",
+    "p25",
+    "p50",
+    "p75",
+    "min_date",
+    "max_date",
+    "date_range_days",
+    "min_length",
+    "max_length",
+    "avg_length",
+    *(f"{fmt}_ratio" for fmt in FORMAT_PATTERNS),
+]
+
 
 class MetricsCalculator:
+    def __init__(self, format_ratios: bool = True) -> None:
+        # Format ratios run on RE2 through Arrow strings only, so results never depend on the backend.
+        self.format_ratios = format_ratios and require_arrow_strings("string format ratios")
+
     def compute_table_metrics(self, df: pd.DataFrame, target_name: str) -> pd.DataFrame:
         metrics = {
             "target_name": target_name,
@@ -56,7 +88,8 @@ class MetricsCalculator:
 
             metrics.append(col_metrics)
 
-        return pd.DataFrame(metrics)
+        # A fixed schema keeps per-target frames appendable to the same output file.
+        return pd.DataFrame(metrics, columns=COLUMN_PROFILE_COLUMNS)
 
     def _numeric_metrics(self, series: pd.Series) -> Dict[str, object]:
         # Convert to numeric to avoid issues with boolean dtype during quantile computations
@@ -96,12 +129,19 @@ class MetricsCalculator:
         }
 
     def _string_metrics(self, series: pd.Series) -> Dict[str, object]:
-        lengths = series.astype(str).str.len()
-        if lengths.empty:
-            return {"min_length": np.nan, "max_length": np.nan, "avg_length": np.nan}
+        if series.empty:
+            metrics: Dict[str, object] = {"min_length": np.nan, "max_length": np.nan, "avg_length": np.nan}
+            metrics.update({f"{fmt}_ratio": np.nan for fmt in FORMAT_PATTERNS})
+            return metrics
 
-        return {
+        # String dtypes (Arrow-backed when available) keep length and regex work vectorized.
+        strings = to_string_series(series)
+        lengths = strings.str.len()
+        metrics = {
             "min_length": lengths.min(),
             "max_length": lengths.max(),
-            "avg_length": lengths.mean(),
+            "avg_length": float(lengths.mean()),
         }
+        if self.format_ratios:
+            metrics.update(format_ratios(strings))
+        return metrics
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import warnings
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, is_string_dtype
+
+from profiler.config import PatternsConfig
+
+
+# Runs of the same character class collapse into a single symbol, e.g. "AB-1234" -> "A-9" and
+# "José Müller" -> "Aa Aa". The regexes run on Arrow strings, i.e. on RE2, which classifies letters
+# by Unicode category; lower-case letters go first so the "a" they produce is not taken for another
+# letter. All regex-based results require Arrow strings, so they never depend on the regex engine.
+_SHAPE_REPLACEMENTS = (
+    (r"[\p{Ll}\p{Lm}\p{Lo}]+", "a"),
+    (r"[\p{Lu}\p{Lt}]+", "A"),
+    (r"\p{Nd}+", "9"),
+    (r"\s+", " "),
+)
+
+FORMAT_PATTERNS: Dict[str, str] = {
+    "numeric_text": r"\s*[-+]?(?:[0-9]+(?:[.,][0-9]+)?|[.,][0-9]+)(?:[eE][-+]?[0-9]+)?\s*",
+    "date": (
+        r"[0-9]{4}-[0-9]{2}-[0-9]{2}(?:[ T][0-9]{2}:[0-9]{2}(?::[0-9]{2}(?:\.[0-9]+)?)?)?"
+        r"|[0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4}"
+    ),
+    "email": r"[^@\s]+@[^@\s]+\.[^@\s]+",
+    "guid": r"\{?[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\}?",
+}
+
+
+def arrow_strings_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def require_arrow_strings(feature: str) -> bool:
+    """Whether `feature` can run; warns when it is skipped for lack of pyarrow."""
+    if arrow_strings_available():
+        return True
+    warnings.warn(f"pyarrow is not installed: {feature} are skipped.", RuntimeWarning, stacklevel=3)
+    return False
+
+
+def is_arrow_backed(strings: pd.Series) -> bool:
+    return isinstance(strings.dtype, pd.StringDtype) and strings.dtype.storage == "pyarrow"
+
+
+def to_string_series(series: pd.Series) -> pd.Series:
+    """
+    Return `series` as a pandas string dtype, Arrow-backed when pyarrow is
+    available. Arrow-backed series are returned as-is. Only Arrow-backed
+    results may be passed to `shape_patterns` and `format_ratios`.
+    """
+    if is_arrow_backed(series):
+        return series
+    if arrow_strings_available():
+        return series.astype("string[pyarrow]")
+    if isinstance(series.dtype, pd.StringDtype):
+        return series
+    return series.astype("string")
+
+
+def _check_arrow_backed(strings: pd.Series) -> None:
+    if not is_arrow_backed(strings):
+        raise ValueError("String patterns require an Arrow-backed string series (see to_string_series).")
+
+
+def shape_patterns(strings: pd.Series, max_length: int) -> pd.Series:
+    """Reduce each value to its character-class shape, truncated to `max_length` characters."""
+    _check_arrow_backed(strings)
+    shapes = strings.str.slice(0, max_length)
+    for regex, symbol in _SHAPE_REPLACEMENTS:
+        shapes = shapes.str.replace(regex, symbol, regex=True)
+    return shapes
+
+
+def distinct_counts(strings: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+    """
+    Distinct values of `strings` and their counts, so regex work runs once per
+    distinct value. Columns with mostly unique values are returned unchanged,
+    each with a count of one, as deduplicating them would not pay off.
+    """
+    counts = strings.value_counts(sort=False)
+    if len(counts) * 2 > len(strings):
+        return strings.reset_index(drop=True), np.ones(len(strings), dtype=np.int64)
+    values = pd.Series(counts.index, dtype=strings.dtype)
+    return values, counts.to_numpy(dtype=np.int64)
+
+
+def format_ratios(strings: pd.Series) -> Dict[str, float]:
+    _check_arrow_backed(strings)
+    total = len(strings)
+    if total == 0:
+        return {f"{fmt}_ratio": np.nan for fmt in FORMAT_PATTERNS}
+
+    values, counts = distinct_counts(strings)
+    ratios: Dict[str, float] = {}
+    for fmt, regex in FORMAT_PATTERNS.items():
+        matches = values.str.fullmatch(regex).fillna(False).to_numpy(dtype=bool)
+        ratios[f"{fmt}_ratio"] = float(counts[matches].sum()) / total
+    return ratios
+
+
+def is_text_column(series: pd.Series) -> bool:
+    return not is_bool_dtype(series) and not is_numeric_dtype(series) and is_string_dtype(series)
+
+
+class PatternProfiler:
+    def __init__(self, config: PatternsConfig) -> None:
+        self.config = config
+        self.enabled = config.enabled and require_arrow_strings("string shape patterns")
+
+    def detect(self, df: pd.DataFrame, target_name: str) -> pd.DataFrame:
+        """Most frequent shape patterns per text column, at most `max_patterns` each."""
+        columns = ["target_name", "column_name", "pattern", "count", "ratio", "rank"]
+        if not self.enabled:
+            return pd.DataFrame(columns=columns)
+
+        frames: List[pd.DataFrame] = []
+        for col_name in df.columns:
+            series = df[col_name]
+            if not is_text_column(series):
+                continue
+            strings = to_string_series(series.dropna())
+            if strings.empty:
+                continue
+
+            values, value_counts = distinct_counts(strings)
+            shapes = shape_patterns(values, self.config.max_length)
+            counts = (
+                pd.Series(value_counts, index=shapes.index)
+                .groupby(shapes, sort=False)
+                .sum()
+                .sort_values(ascending=False, kind="stable")
+            )
+            top = counts.head(self.config.max_patterns)
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "target_name": target_name,
+                        "column_name": col_name,
+                        "pattern": top.index.astype(object),
+                        "count": top.to_numpy(dtype=np.int64),
+                        "ratio": top.to_numpy(dtype=float) / len(strings),
+                        "rank": np.arange(1, len(top) + 1),
+                    }
+                )
+            )
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
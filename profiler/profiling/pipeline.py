@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Callable, Deque, Generic, Iterable, Iterator, Optional, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class Prefetcher(Generic[T]):
+    """
+    Iterates `items` on a background thread, buffering at most `depth` items
+    and, unless the buffer is empty, at most `max_bytes` as measured by
+    `size_of` (which also runs on the producer thread). The producer measures
+    an item only after building it, and the item being consumed no longer
+    counts, so peak memory is the ceiling plus the item being produced plus
+    the item the consumer is working on. An exception raised by the producer
+    is re-raised to the consumer once the items buffered before it have been
+    consumed.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[T],
+        depth: int,
+        max_bytes: Optional[int] = None,
+        size_of: Optional[Callable[[T], int]] = None,
+    ) -> None:
+        if depth < 1:
+            raise ValueError("Prefetch depth must be at least 1.")
+        self._items = items
+        self._depth = depth
+        self._max_bytes = max_bytes
+        self._size_of = size_of or (lambda item: 0)
+        self._buffer: Deque[Tuple[T, int]] = deque()
+        self._buffered_bytes = 0
+        self._condition = threading.Condition()
+        self._done = False
+        self._stopped = False
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._produce, name="profiler-prefetch", daemon=True)
+        self._thread.start()
+
+    def _has_room(self, size: int) -> bool:
+        if not self._buffer:
+            return True
+        if len(self._buffer) >= self._depth:
+            return False
+        return self._max_bytes is None or self._buffered_bytes + size <= self._max_bytes
+
+    def _produce(self) -> None:
+        try:
+            for item in self._items:
+                size = int(self._size_of(item))
+                with self._condition:
+                    while not self._stopped and not self._has_room(size):
+                        self._condition.wait()
+                    if self._stopped:
+                        return
+                    self._buffer.append((item, size))
+                    self._buffered_bytes += size
+                    self._condition.notify_all()
+        except BaseException as exc:  # re-raised on the consumer thread
+            self._error = exc
+        finally:
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+
+    def __iter__(self) -> Iterator[T]:
+        while True:
+            with self._condition:
+                while not self._buffer and not self._done:
+                    self._condition.wait()
+                if self._buffer:
+                    item, size = self._buffer.popleft()
+                    self._buffered_bytes -= size
+                    self._condition.notify_all()
+                elif self._error is not None:
+                    raise self._error
+                else:
+                    return
+            yield item
+
+    def close(self) -> None:
+        """
+        Stop producing and wait for the producer to finish its current item.
+        This blocks until an in-flight fetch returns, so a consumer error or
+        Ctrl-C surfaces only then. There is deliberately no timeout: the
+        producer shares the caller's connection, which must not be closed or
+        reused while the fetch is still running on it.
+        """
+        with self._condition:
+            self._stopped = True
+            self._buffer.clear()
+            self._buffered_bytes = 0
+            self._condition.notify_all()
+        self._thread.join()
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import pandas as pd
 
 from profiler.config import Config
-from profiler.connectors import OracleConnector, SqlServerConnector
+from profiler.connectors import DatabaseConnector, OracleConnector, SqlServerConnector
+from profiler.profiling.dependencies import DependencyAnalyzer
 from profiler.profiling.metrics import MetricsCalculator
 from profiler.profiling.outliers import OutlierDetector
+from profiler.profiling.patterns import PatternProfiler
+from profiler.profiling.pipeline import Prefetcher
+from profiler.profiling.scans import ScanGroup, build_shared_sql, plan_scans, split_shared_frame
 from profiler.profiling.targets import ProfileTarget, TargetLoader
+from profiler.reporting.checkpoint import RESULT_KINDS, ResultWriter, RunManifest
+from profiler.reporting.history import HistoryStore, new_run_id, utc_now
 
 
 @dataclass
@@ -17,22 +23,36 @@ class ProfilingResults:
     table_profile: pd.DataFrame
     column_profile: pd.DataFrame
     outliers: pd.DataFrame
+    string_patterns: pd.DataFrame = field(default_factory=pd.DataFrame)
+    dependencies: pd.DataFrame = field(default_factory=pd.DataFrame)
+    run_id: Optional[str] = None
+
+
+def create_connector(engine: str, connection_string: str) -> DatabaseConnector:
+    normalized = engine.lower()
+    if normalized in ("sqlserver", "mssql", "sql_server"):
+        return SqlServerConnector(connection_string)
+    if normalized in ("oracle", "ora"):
+        return OracleConnector(connection_string)
+    raise ValueError(f"Unsupported engine: {engine}")
 
 
 class Profiler:
-    def __init__(self, config: Config) -> None:
+    def __init__(self, config: Config, connector: Optional[DatabaseConnector] = None) -> None:
+        """
+        `connector`, when given, is expected to be connected already and is
+        left open after `run`, so long-lived callers can reuse it.
+        """
         self.config = config
-        self.connector = self._create_connector()
-        self.metrics = MetricsCalculator()
+        self._owns_connector = connector is None
+        self.connector = connector if connector is not None else self._create_connector()
+        self.metrics = MetricsCalculator(format_ratios=config.patterns.enabled)
         self.outlier_detector = OutlierDetector(config.outliers)
+        self.pattern_profiler = PatternProfiler(config.patterns)
+        self.dependency_analyzer = DependencyAnalyzer(config.dependencies)
 
-    def _create_connector(self) -> object:
-        engine = self.config.engine.lower()
-        if engine in ("sqlserver", "mssql", "sql_server"):
-            return SqlServerConnector(self.config.connection_string)
-        if engine in ("oracle", "ora"):
-            return OracleConnector(self.config.connection_string)
-        raise ValueError(f"Unsupported engine: {self.config.engine}")
+    def _create_connector(self) -> DatabaseConnector:
+        return create_connector(self.config.engine, self.config.connection_string)
 
     def _load_targets(self) -> List[ProfileTarget]:
         if not self.config.targets_file:
@@ -53,33 +73,121 @@ class Profiler:
         rows = list(self.connector.sample_data(base_sql, sample_rows))
         return pd.DataFrame(rows)
 
-    def run(self) -> ProfilingResults:
-        table_profiles: List[pd.DataFrame] = []
-        column_profiles: List[pd.DataFrame] = []
-        outlier_profiles: List[pd.DataFrame] = []
-
-        self.connector.connect()
-        try:
+    def _load_scan_group(self, group: ScanGroup) -> List[Tuple[ProfileTarget, pd.DataFrame]]:
+        if not group.shared:
+            return [(group.targets[0], self._load_target_data(group.targets[0]))]
+
+        rows = list(self.connector.sample_data(build_shared_sql(group), group.total_sample_rows))
+        frames = split_shared_frame(group, pd.DataFrame(rows))
+        return [
+            (target, df if df is not None else self._load_target_data(target))
+            for target, df in zip(group.targets, frames)
+        ]
+
+    def _profile_frame(self, df: pd.DataFrame, target_name: str) -> Dict[str, pd.DataFrame]:
+        return {
+            "table_profile": self.metrics.compute_table_metrics(df, target_name),
+            "column_profile": self.metrics.compute_column_metrics(df, target_name),
+            "outliers": self.outlier_detector.detect(df, target_name),
+            "string_patterns": self.pattern_profiler.detect(df, target_name),
+            "dependencies": self.dependency_analyzer.detect(df, target_name),
+        }
+
+    def _start_manifest(self, writer: Optional[ResultWriter]) -> RunManifest:
+        manifest = RunManifest.load(writer.outdir) if writer is not None and self.config.resume else None
+        if manifest is not None:
+            if manifest.output_format != self.config.output_format:
+                raise ValueError(
+                    f"Cannot resume a '{manifest.output_format}' run with output format '{self.config.output_format}'."
+                )
+            if manifest.offsets is not None:
+                writer.truncate(manifest.offsets)
+            manifest.status = "running"
+            manifest.error = None
+            return manifest
+
+        manifest = RunManifest(run_id=new_run_id(), run_ts=utc_now(), output_format=self.config.output_format)
+        if writer is not None:
+            writer.reset()
+            manifest.offsets = writer.offsets()
+        return manifest
+
+    def run(self, targets: Optional[List[ProfileTarget]] = None) -> ProfilingResults:
+        """
+        Profile every target. With `outdir` set, each target's results are
+        appended to the output files and recorded in the run manifest as soon
+        as it completes; with `resume`, targets completed by a previous run of
+        the same manifest are skipped. The returned results only cover the
+        targets profiled by this call.
+        """
+        collected: Dict[str, List[pd.DataFrame]] = {kind: [] for kind in RESULT_KINDS}
+
+        # Load targets first, so an invalid targets file leaves a previous run's outputs untouched.
+        if targets is None:
             targets = self._load_targets()
-            for target in targets:
-                df = self._load_target_data(target)
-                target_name = target.target_name
+        writer = ResultWriter(self.config.outdir, self.config.output_format) if self.config.outdir else None
+        manifest = self._start_manifest(writer)
+        history = HistoryStore(self.config.history_db) if self.config.history_db else None
 
-                table_profiles.append(self.metrics.compute_table_metrics(df, target_name))
-                column_profiles.append(self.metrics.compute_column_metrics(df, target_name))
-
-                outliers_df = self.outlier_detector.detect(df, target_name)
-                if not outliers_df.empty:
-                    outlier_profiles.append(outliers_df)
+        prefetcher: Optional[Prefetcher[Tuple[ProfileTarget, pd.DataFrame]]] = None
+        if self._owns_connector:
+            self.connector.connect()
+        try:
+            pending = [target for target in targets if target.fingerprint not in manifest.completed]
+            groups = plan_scans(pending, self.config.sample_rows, shared=self.config.shared_scans)
+            loaded: Iterable[Tuple[ProfileTarget, pd.DataFrame]] = (
+                item for group in groups for item in self._load_scan_group(group)
+            )
+            if self.config.prefetch_depth > 0:
+                # Fetch upcoming targets on a background thread while this one is profiled.
+                prefetcher = Prefetcher(
+                    loaded,
+                    depth=self.config.prefetch_depth,
+                    max_bytes=self.config.prefetch_max_bytes,
+                    size_of=lambda item: int(item[1].memory_usage(deep=True).sum()),
+                )
+                loaded = prefetcher
+            for target, df in loaded:
+                frames = self._profile_frame(df, target.target_name)
+
+                for kind, frame in frames.items():
+                    if kind in ("table_profile", "column_profile") or not frame.empty:
+                        collected[kind].append(frame)
+
+                # History replaces a target's rows on re-record, so it goes first: the output write and the
+                # manifest save that commits it are then adjacent, and a crash between them is undone on resume.
+                if history is not None:
+                    history.record(
+                        manifest.run_id,
+                        manifest.run_ts,
+                        frames["table_profile"],
+                        frames["column_profile"],
+                        frames["outliers"],
+                        engine=self.config.engine,
+                        target_key=target.fingerprint,
+                    )
+                if writer is not None:
+                    writer.write(frames)
+                    manifest.completed[target.fingerprint] = target.target_name
+                    manifest.offsets = writer.offsets()
+                    manifest.save(writer.outdir)
+            manifest.status = "completed"
+        except Exception as exc:
+            manifest.status = "failed"
+            manifest.error = f"{type(exc).__name__}: {exc}"
+            raise
         finally:
-            self.connector.close()
-
-        table_profile_df = pd.concat(table_profiles, ignore_index=True) if table_profiles else pd.DataFrame()
-        column_profile_df = pd.concat(column_profiles, ignore_index=True) if column_profiles else pd.DataFrame()
-        outliers_df = pd.concat(outlier_profiles, ignore_index=True) if outlier_profiles else pd.DataFrame()
-
-        return ProfilingResults(
-            table_profile=table_profile_df,
-            column_profile=column_profile_df,
-            outliers=outliers_df,
-        )
+            if prefetcher is not None:
+                prefetcher.close()
+            if self._owns_connector:
+                self.connector.close()
+            if history is not None:
+                history.close()
+            if writer is not None:
+                manifest.save(writer.outdir)
+
+        combined = {
+            kind: pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+            for kind, frames in collected.items()
+        }
+        return ProfilingResults(**combined, run_id=manifest.run_id)
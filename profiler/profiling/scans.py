@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from profiler.profiling.targets import ProfileTarget
+
+
+TAG_PREFIX = "pf_tag_"
+
+
+@dataclass
+class ScanGroup:
+    """Targets served by one query. Filtered table targets on the same table share a group."""
+
+    targets: List[ProfileTarget] = field(default_factory=list)
+    sample_rows: List[int] = field(default_factory=list)
+
+    @property
+    def shared(self) -> bool:
+        return len(self.targets) > 1
+
+    @property
+    def total_sample_rows(self) -> int:
+        return sum(self.sample_rows)
+
+
+def plan_scans(targets: Sequence[ProfileTarget], default_sample_rows: int, shared: bool = True) -> List[ScanGroup]:
+    """
+    Group filtered table targets by base table, keeping the order in which each
+    table first appears. Unfiltered targets always get a group of their own:
+    the shared query restricts rows to the union of the filters, which would
+    silently filter them too.
+    """
+    groups: List[ScanGroup] = []
+    by_table: Dict[Tuple[str, str], ScanGroup] = {}
+
+    for target in targets:
+        sample_rows = target.sample_rows if target.sample_rows is not None else default_sample_rows
+        if shared and target.type == "table" and target.schema and target.table and target.where:
+            key = (target.schema.lower(), target.table.lower())
+            group = by_table.get(key)
+            if group is None:
+                group = by_table[key] = ScanGroup()
+                groups.append(group)
+        else:
+            group = ScanGroup()
+            groups.append(group)
+        group.targets.append(target)
+        group.sample_rows.append(int(sample_rows))
+
+    return groups
+
+
+def build_shared_sql(group: ScanGroup) -> str:
+    """
+    One scan over the base table tagging each row with the targets whose
+    filter it matches. Tags use plain identifiers so they are valid on every
+    supported engine.
+    """
+    first = group.targets[0]
+    select_list = ["t.*"]
+    for index, target in enumerate(group.targets):
+        select_list.append(f"CASE WHEN ({target.where}) THEN 1 ELSE 0 END AS {TAG_PREFIX}{index}")
+
+    predicates = " OR ".join(f"({target.where})" for target in group.targets)
+    return f"SELECT {', '.join(select_list)} FROM {first.schema}.{first.table} t WHERE {predicates}"
+
+
+def split_shared_frame(group: ScanGroup, df: pd.DataFrame) -> List[Optional[pd.DataFrame]]:
+    """
+    Split the shared scan back into one frame per target, capped at each
+    target's sample size. A target gets `None` when the scan hit its row limit
+    before the target's own sample was filled; it must then be fetched alone.
+    """
+    # Oracle reports unquoted identifiers in upper case.
+    tag_columns = {str(col).lower(): col for col in df.columns if str(col).lower().startswith(TAG_PREFIX)}
+    data = df.drop(columns=list(tag_columns.values()))
+    exhausted = len(df) < group.total_sample_rows
+
+    frames: List[Optional[pd.DataFrame]] = []
+    for index, (target, sample_rows) in enumerate(zip(group.targets, group.sample_rows)):
+        tag = tag_columns.get(f"{TAG_PREFIX}{index}")
+        subset = data[df[tag] == 1] if tag is not None else data.iloc[0:0]
+        if len(subset) < sample_rows and not exhausted:
+            frames.append(None)
+        else:
+            frames.append(subset.head(sample_rows).reset_index(drop=True))
+    return frames
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import List, Optional
 
@@ -18,6 +19,7 @@ class ProfileTarget:
     name: Optional[str] = None
     where: Optional[str] = None
     sample_rows: Optional[int] = None
+    interval_seconds: Optional[float] = None
 
     @property
     def target_name(self) -> str:
@@ -27,8 +29,25 @@ class ProfileTarget:
             return f"{self.schema}.{self.table}"
         return "query"
 
+    @property
+    def fingerprint(self) -> str:
+        """Stable identifier of the target definition, used to match targets across runs."""
+        definition = asdict(self)
+        definition.pop("interval_seconds")  # scheduling does not change what is profiled
+        payload = json.dumps(definition, sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
 
 class TargetLoader:
+    @staticmethod
+    def _interval_seconds(entry: dict) -> Optional[float]:
+        interval = entry.get("interval_seconds")
+        if interval is None:
+            return None
+        if isinstance(interval, bool) or not isinstance(interval, (int, float)) or not interval > 0:
+            raise ValueError(f"'interval_seconds' must be a positive number, got {interval!r}.")
+        return float(interval)
+
     @staticmethod
     def from_json_file(path: str | Path) -> List[ProfileTarget]:
         json_path = Path(path)
@@ -65,6 +84,7 @@ class TargetLoader:
                     where=entry.get("where"),
                     name=entry.get("name"),
                     sample_rows=entry.get("sample_rows"),
+                    interval_seconds=TargetLoader._interval_seconds(entry),
                 )
             else:  # query
                 sql = entry.get("sql")
@@ -75,6 +95,7 @@ class TargetLoader:
                     sql=sql,
                     name=entry.get("name"),
                     sample_rows=entry.get("sample_rows"),
+                    interval_seconds=TargetLoader._interval_seconds(entry),
                 )
 
             targets.append(target)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional
+
+import pandas as pd
+
+from profiler.profiling.metrics import COLUMN_PROFILE_COLUMNS
+from profiler.reporting.exporters import Exporters
+
+
+RESULT_KINDS = ("table_profile", "column_profile", "outliers", "string_patterns", "dependencies")
+OUTPUT_FORMATS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ""}
+MANIFEST_FILE = "run_manifest.json"
+
+_DATETIME = "datetime64[us]"
+_COLUMN_PROFILE_TYPES = {
+    "target_name": "string",
+    "column_name": "string",
+    "total_rows": "Int64",
+    "null_count": "Int64",
+    "distinct_count": "Int64",
+    "min_date": _DATETIME,
+    "max_date": _DATETIME,
+}
+
+# Parquet parts of one kind are read back as a single dataset, so every part must have the same
+# column types whatever the target's columns were (e.g. `min_date` is all-NaN floats without dates).
+RESULT_DTYPES: Dict[str, Dict[str, str]] = {
+    "table_profile": {"target_name": "string", "row_count_sample": "Int64", "column_count": "Int64"},
+    "column_profile": {col: _COLUMN_PROFILE_TYPES.get(col, "float64") for col in COLUMN_PROFILE_COLUMNS},
+    "outliers": {
+        "target_name": "string",
+        "column_name": "string",
+        "method": "string",
+        "sample_size": "Int64",
+        "outlier_count": "Int64",
+        "outlier_ratio": "float64",
+        "min_outlier": "float64",
+        "max_outlier": "float64",
+    },
+    "string_patterns": {
+        "target_name": "string",
+        "column_name": "string",
+        "pattern": "string",
+        "count": "Int64",
+        "ratio": "float64",
+        "rank": "Int64",
+    },
+    "dependencies": {
+        "target_name": "string",
+        "kind": "string",
+        "lhs": "string",
+        "rhs": "string",
+        "width": "Int64",
+        "search_complete": "boolean",
+    },
+}
+
+
+def with_result_dtypes(kind: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Cast `df` to the fixed column types of `kind`; timezone-aware dates are stored as naive UTC."""
+    typed = df.copy()
+    for col, dtype in RESULT_DTYPES[kind].items():
+        if col not in typed.columns:
+            continue
+        if dtype == _DATETIME:
+            typed[col] = pd.to_datetime(typed[col], utc=True).dt.tz_localize(None).astype(_DATETIME)
+        else:
+            typed[col] = typed[col].astype(dtype)
+    return typed
+
+
+class ResultWriter:
+    """Appends each target's results to `<outdir>/<kind><ext>` as soon as the target completes."""
+
+    def __init__(self, outdir: str | Path, output_format: str = "csv") -> None:
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format '{output_format}'. Supported: {set(OUTPUT_FORMATS)}")
+        self.outdir = Path(outdir)
+        self.output_format = output_format
+
+    def path_for(self, kind: str) -> Path:
+        return self.outdir / f"{kind}{OUTPUT_FORMATS[self.output_format]}"
+
+    def reset(self) -> None:
+        """
+        Remove outputs left by a previous run so a fresh run does not append to
+        them. Only files this writer creates are removed: a parquet output folder
+        is deleted once its part files are gone, and only if nothing else is in it.
+        """
+        for kind in RESULT_KINDS:
+            path = self.path_for(kind)
+            if path.is_dir():
+                for part in self._parts(kind):
+                    part.unlink()
+                if not any(path.iterdir()):
+                    path.rmdir()
+            elif path.exists():
+                path.unlink()
+
+    def _parts(self, kind: str) -> List[Path]:
+        return sorted(self.path_for(kind).glob("part-*.parquet"))
+
+    def offsets(self) -> Dict[str, int]:
+        """Current end of every output: bytes for csv/jsonl, part file count for parquet."""
+        offsets: Dict[str, int] = {}
+        for kind in RESULT_KINDS:
+            path = self.path_for(kind)
+            if self.output_format == "parquet":
+                offsets[kind] = len(self._parts(kind)) if path.is_dir() else 0
+            else:
+                offsets[kind] = path.stat().st_size if path.exists() else 0
+        return offsets
+
+    def truncate(self, offsets: Mapping[str, int]) -> None:
+        """Cut every output back to `offsets`, dropping rows written after the last committed target."""
+        for kind in RESULT_KINDS:
+            offset = int(offsets.get(kind, 0))
+            path = self.path_for(kind)
+            if self.output_format == "parquet":
+                if path.is_dir():
+                    for part in self._parts(kind)[offset:]:
+                        part.unlink()
+            elif path.exists():
+                if offset == 0:
+                    path.unlink()
+                else:
+                    with path.open("r+b") as handle:
+                        handle.truncate(offset)
+
+    def write(self, frames: Mapping[str, pd.DataFrame]) -> None:
+        for kind in RESULT_KINDS:
+            df = frames.get(kind)
+            if df is None or df.empty:
+                continue
+            if self.output_format == "csv":
+                Exporters.append_to_csv(df, self.path_for(kind))
+            elif self.output_format == "jsonl":
+                Exporters.append_to_jsonl(df, self.path_for(kind))
+            else:
+                Exporters.append_to_parquet(with_result_dtypes(kind, df), self.path_for(kind))
+
+
+@dataclass
+class RunManifest:
+    """
+    Progress of a run, rewritten after every completed target. `completed`
+    maps target fingerprints to target names; `--resume` skips those targets.
+    `offsets` holds the output ends (see `ResultWriter.offsets`) as of the last
+    completed target; `--resume` cuts the outputs back to them, so rows of a
+    target that failed halfway are never kept.
+    """
+
+    run_id: str
+    run_ts: str
+    output_format: str = "csv"
+    status: str = "running"
+    error: Optional[str] = None
+    completed: Dict[str, str] = field(default_factory=dict)
+    offsets: Optional[Dict[str, int]] = None
+
+    @staticmethod
+    def path_in(outdir: str | Path) -> Path:
+        return Path(outdir) / MANIFEST_FILE
+
+    @classmethod
+    def load(cls, outdir: str | Path) -> Optional["RunManifest"]:
+        path = cls.path_in(outdir)
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON in run manifest {path}: {exc}") from exc
+        return cls(**data)
+
+    def save(self, outdir: str | Path) -> None:
+        path = self.path_in(outdir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(asdict(self), indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
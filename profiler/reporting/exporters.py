@@ -17,3 +17,34 @@ class Exporters:
         output_path = Path(path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         df.to_json(output_path, orient="records", force_ascii=False)
+
+    @staticmethod
+    def append_to_csv(df: pd.DataFrame, path: str | Path) -> None:
+        output_path = Path(path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if output_path.exists() and output_path.stat().st_size > 0:
+            header = pd.read_csv(output_path, nrows=0).columns
+            df.reindex(columns=header).to_csv(output_path, mode="a", header=False, index=False)
+        else:
+            df.to_csv(output_path, index=False)
+
+    @staticmethod
+    def append_to_jsonl(df: pd.DataFrame, path: str | Path) -> None:
+        output_path = Path(path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if df.empty:
+            return
+        payload = df.to_json(orient="records", lines=True, force_ascii=False, date_format="iso")
+        with output_path.open("a", encoding="utf-8") as handle:
+            handle.write(payload if payload.endswith("\n") else payload + "\n")
+
+    @staticmethod
+    def append_to_parquet(df: pd.DataFrame, path: str | Path) -> None:
+        """Parquet files cannot be appended to, so `path` is a directory of numbered part files."""
+        output_dir = Path(path)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        part = len(list(output_dir.glob("part-*.parquet")))
+        try:
+            df.to_parquet(output_dir / f"part-{part:05d}.parquet", index=False)
+        except ImportError as exc:  # pragma: no cover - import guard
+            raise RuntimeError("pyarrow is required for parquet output") from exc
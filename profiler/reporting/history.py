@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import sqlite3
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+
+# Identifier columns per result kind; every other column is stored as a metric row.
+_ID_COLUMNS = {
+    "table": ("target_name",),
+    "column": ("target_name", "column_name"),
+    "outlier": ("target_name", "column_name"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    run_ts TEXT NOT NULL,
+    engine TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL,
+    run_ts TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    target_name TEXT NOT NULL,
+    column_name TEXT NOT NULL DEFAULT '',
+    metric TEXT NOT NULL,
+    value REAL,
+    value_text TEXT,
+    target_key TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_series
+    ON metrics (target_name, column_name, metric, run_ts);
+CREATE INDEX IF NOT EXISTS idx_metrics_run
+    ON metrics (run_id, kind, target_name, column_name);
+CREATE INDEX IF NOT EXISTS idx_metrics_target_key
+    ON metrics (run_id, target_key);
+CREATE INDEX IF NOT EXISTS idx_runs_ts ON runs (run_ts);
+"""
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class HistoryStore:
+    """
+    SQLite store of profiling results, one metric per row.
+    Queries run in SQL against the indexes, so time series and run
+    comparisons never load the full history into pandas.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def record(
+        self,
+        run_id: str,
+        run_ts: str,
+        table_profile: Optional[pd.DataFrame] = None,
+        column_profile: Optional[pd.DataFrame] = None,
+        outliers: Optional[pd.DataFrame] = None,
+        engine: Optional[str] = None,
+        target_key: Optional[str] = None,
+    ) -> None:
+        """
+        Append profiles to `run_id`; may be called repeatedly for the same run.
+        With `target_key`, rows previously recorded under the same run and key
+        are replaced, so recording a target again (e.g. on resume) is idempotent.
+        """
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO runs (run_id, run_ts, engine) VALUES (?, ?, ?)",
+                (run_id, run_ts, engine),
+            )
+            if target_key is not None:
+                self._conn.execute(
+                    "DELETE FROM metrics WHERE run_id = ? AND target_key = ?",
+                    (run_id, target_key),
+                )
+            for kind, df in (("table", table_profile), ("column", column_profile), ("outlier", outliers)):
+                if df is None or df.empty:
+                    continue
+                self._conn.executemany(
+                    "INSERT INTO metrics "
+                    "(run_id, run_ts, kind, target_name, column_name, metric, value, value_text, target_key) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (row + (target_key or "",) for row in self._metric_rows(run_id, run_ts, kind, df)),
+                )
+
+    @staticmethod
+    def _metric_rows(run_id: str, run_ts: str, kind: str, df: pd.DataFrame) -> Iterable[Tuple[object, ...]]:
+        id_columns = [col for col in _ID_COLUMNS[kind] if col in df.columns]
+        long_df = df.melt(id_vars=id_columns, var_name="metric", value_name="raw")
+        long_df = long_df[long_df["raw"].notna()]
+        numeric = pd.to_numeric(long_df["raw"], errors="coerce")
+        targets = long_df["target_name"].astype(str)
+        columns = long_df["column_name"].astype(str) if "column_name" in long_df else pd.Series("", index=long_df.index)
+
+        for target, column, metric, raw, value in zip(targets, columns, long_df["metric"], long_df["raw"], numeric):
+            if pd.isna(value):
+                yield (run_id, run_ts, kind, target, column, str(metric), None, str(raw))
+            else:
+                yield (run_id, run_ts, kind, target, column, str(metric), float(value), None)
+
+    def list_runs(self) -> pd.DataFrame:
+        return pd.read_sql_query("SELECT run_id, run_ts, engine FROM runs ORDER BY run_ts", self._conn)
+
+    def metric_series(
+        self,
+        target_name: str,
+        metric: str,
+        column_name: Optional[str] = None,
+        kind: Optional[str] = None,
+        since: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Return `run_id, run_ts, value, value_text` of one metric ordered by run time."""
+        if kind is None:
+            kind = "table" if column_name is None else "column"
+        sql = (
+            "SELECT run_id, run_ts, value, value_text FROM metrics "
+            "WHERE target_name = ? AND column_name = ? AND metric = ? AND kind = ?"
+        )
+        params: List[object] = [target_name, column_name or "", metric, kind]
+        if since:
+            sql += " AND run_ts >= ?"
+            params.append(since)
+        sql += " ORDER BY run_ts"
+        return pd.read_sql_query(sql, self._conn, params=params)
+
+    def compare_runs(
+        self,
+        run_a: str,
+        run_b: str,
+        null_ratio_jump: float = 0.1,
+        distinct_collapse: float = 0.5,
+    ) -> pd.DataFrame:
+        """
+        Compare column profiles of two runs. A column is flagged when its null
+        ratio grows by at least `null_ratio_jump`, or its distinct count in
+        `run_b` falls to `distinct_collapse` (or less) of the one in `run_a`.
+        """
+        sql = """
+        WITH pivot AS (
+            SELECT
+                run_id,
+                target_name,
+                column_name,
+                MAX(CASE WHEN metric = 'null_ratio' THEN value END) AS null_ratio,
+                MAX(CASE WHEN metric = 'distinct_count' THEN value END) AS distinct_count
+            FROM metrics
+            WHERE kind = 'column' AND run_id IN (?, ?) AND metric IN ('null_ratio', 'distinct_count')
+            GROUP BY run_id, target_name, column_name
+        )
+        SELECT
+            a.target_name,
+            a.column_name,
+            a.null_ratio AS null_ratio_a,
+            b.null_ratio AS null_ratio_b,
+            b.null_ratio - a.null_ratio AS null_ratio_delta,
+            a.distinct_count AS distinct_count_a,
+            b.distinct_count AS distinct_count_b,
+            CASE WHEN b.null_ratio - a.null_ratio >= ? THEN 1 ELSE 0 END AS null_ratio_jump,
+            CASE WHEN a.distinct_count > 0 AND b.distinct_count <= a.distinct_count * ? THEN 1 ELSE 0 END
+                AS distinct_collapse
+        FROM pivot a
+        JOIN pivot b
+            ON a.target_name = b.target_name AND a.column_name = b.column_name
+        WHERE a.run_id = ? AND b.run_id = ?
+        ORDER BY a.target_name, a.column_name
+        """
+        df = pd.read_sql_query(
+            sql,
+            self._conn,
+            params=[run_a, run_b, null_ratio_jump, distinct_collapse, run_a, run_b],
+        )
+        df["null_ratio_jump"] = df["null_ratio_jump"].astype(bool)
+        df["distinct_collapse"] = df["distinct_collapse"].astype(bool)
+        return df
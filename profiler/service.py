@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import json
+import queue
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, replace
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from profiler.config import Config, ServiceConfig
+from profiler.connectors import DatabaseConnector
+from profiler.profiling.profiler import Profiler, create_connector
+from profiler.profiling.targets import ProfileTarget, TargetLoader
+from profiler.reporting.history import new_run_id, utc_now
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class UnknownTargetError(ValueError):
+    pass
+
+
+@dataclass
+class Job:
+    job_id: str
+    targets: List[str]
+    trigger: str
+    status: str = "queued"
+    submitted_at: str = field(default_factory=utc_now)
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    run_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ProfilingService:
+    """
+    Long-running profiler. Targets are parsed once (and on `reload`), each
+    worker thread keeps its own connector open between jobs, and jobs flow
+    through a bounded queue: when it is full, new requests are rejected
+    instead of buffered. Targets with an interval are enqueued by the
+    scheduler whenever they are due and not already queued or running.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        service_config: ServiceConfig,
+        connector_factory: Optional[Callable[[], DatabaseConnector]] = None,
+    ) -> None:
+        # queue.Queue(maxsize=0) is unbounded, and without workers queued jobs would never run.
+        if service_config.queue_size < 1:
+            raise ValueError("queue_size must be at least 1.")
+        if service_config.workers < 1:
+            raise ValueError("workers must be at least 1.")
+        self.config = config
+        self.service_config = service_config
+        self.connector_factory = connector_factory or (
+            lambda: create_connector(config.engine, config.connection_string)
+        )
+        self._queue: "queue.Queue[Tuple[Job, List[ProfileTarget]]]" = queue.Queue(maxsize=service_config.queue_size)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active_targets: Dict[str, str] = {}
+        self._next_due: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._server: Optional[socketserver.BaseServer] = None
+        self.targets: List[ProfileTarget] = []
+        self.reload_targets()
+
+    def reload_targets(self) -> List[ProfileTarget]:
+        if not self.config.targets_file:
+            raise ValueError("targets_file must be provided in Config.")
+        targets = TargetLoader.from_json_file(self.config.targets_file)
+        # Build the whole new state before swapping it in, so a failure leaves the old one intact.
+        scheduled = [target.fingerprint for target in targets if self._interval(target)]
+        with self._lock:
+            self._next_due = {fingerprint: self._next_due.get(fingerprint, 0.0) for fingerprint in scheduled}
+            self.targets = targets
+        return targets
+
+    def _interval(self, target: ProfileTarget) -> Optional[float]:
+        interval = target.interval_seconds
+        if interval is None:
+            interval = self.service_config.default_interval_seconds
+        return float(interval) if interval else None
+
+    def _resolve(self, names: Optional[List[str]]) -> List[ProfileTarget]:
+        with self._lock:
+            targets = list(self.targets)
+        if not names:
+            return targets
+        invalid = [name for name in names if not isinstance(name, str)]
+        if invalid:
+            raise ValueError(f"Target names must be strings, got {invalid!r}.")
+        missing = set(names) - {target.target_name for target in targets}
+        if missing:
+            raise UnknownTargetError(f"Unknown targets: {sorted(missing)}")
+        return [target for target in targets if target.target_name in names]
+
+    def submit(self, names: Optional[List[str]] = None, trigger: str = "request") -> Job:
+        targets = self._resolve(names)
+        return self._enqueue(targets, trigger)
+
+    def _enqueue(self, targets: List[ProfileTarget], trigger: str) -> Job:
+        job = Job(job_id=new_run_id(), targets=[target.target_name for target in targets], trigger=trigger)
+        with self._lock:
+            try:
+                self._queue.put_nowait((job, targets))
+            except queue.Full as exc:
+                raise QueueFullError(f"Job queue is full ({self.service_config.queue_size} jobs).") from exc
+            self._jobs[job.job_id] = job
+            for target in targets:
+                self._active_targets[target.fingerprint] = job.job_id
+            self._evict_finished_jobs()
+        return job
+
+    def _evict_finished_jobs(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in ("completed", "failed")]
+        for job_id in finished[: max(0, len(finished) - self.service_config.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "status": "stopping" if self._stop.is_set() else "ok",
+            "queued": self._queue.qsize(),
+            "queue_size": self.service_config.queue_size,
+            "workers": self.service_config.workers,
+            "jobs": counts,
+        }
+
+    def _job_config(self, job: Job) -> Config:
+        outdir = str(Path(self.config.outdir) / job.job_id) if self.config.outdir else None
+        return replace(self.config, outdir=outdir, resume=False)
+
+    def _worker(self) -> None:
+        connector: Optional[DatabaseConnector] = None
+        try:
+            while not self._stop.is_set():
+                try:
+                    job, targets = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                job.status = "running"
+                job.started_at = utc_now()
+                try:
+                    if connector is None:
+                        connector = self.connector_factory()
+                        connector.connect()
+                    results = Profiler(self._job_config(job), connector=connector).run(targets)
+                    job.run_id = results.run_id
+                    job.status = "completed"
+                except Exception as exc:
+                    job.status = "failed"
+                    job.error = f"{type(exc).__name__}: {exc}"
+                    # The connection may be broken; the next job reconnects.
+                    if connector is not None:
+                        connector.close()
+                        connector = None
+                finally:
+                    job.finished_at = utc_now()
+                    with self._lock:
+                        for target in targets:
+                            if self._active_targets.get(target.fingerprint) == job.job_id:
+                                del self._active_targets[target.fingerprint]
+                    self._queue.task_done()
+        finally:
+            if connector is not None:
+                connector.close()
+
+    def schedule_due(self, now: Optional[float] = None) -> List[Job]:
+        """Enqueue every due target; a target that does not fit in the queue stays due."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            due = [
+                target
+                for target in self.targets
+                if target.fingerprint in self._next_due
+                and self._next_due[target.fingerprint] <= now
+                and target.fingerprint not in self._active_targets
+            ]
+        jobs: List[Job] = []
+        for target in due:
+            try:
+                jobs.append(self._enqueue([target], trigger="schedule"))
+            except QueueFullError:
+                break
+            with self._lock:
+                self._next_due[target.fingerprint] = now + (self._interval(target) or 0.0)
+        return jobs
+
+    def _scheduler(self) -> None:
+        while not self._stop.wait(1.0):
+            self.schedule_due()
+
+    def start(self) -> None:
+        self._stop.clear()
+        for index in range(self.service_config.workers):
+            self._threads.append(threading.Thread(target=self._worker, name=f"profiler-worker-{index}", daemon=True))
+        self._threads.append(threading.Thread(target=self._scheduler, name="profiler-scheduler", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def serve_forever(self) -> None:
+        self.start()
+        self._server = self._build_server()
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._server is not None:
+            self._server.server_close()
+            if self.service_config.socket_path:
+                Path(self.service_config.socket_path).unlink(missing_ok=True)
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def _build_server(self) -> socketserver.BaseServer:
+        handler = type("BoundServiceHandler", (_ServiceHandler,), {"service": self})
+        if self.service_config.socket_path:
+            Path(self.service_config.socket_path).unlink(missing_ok=True)
+            return _UnixHTTPServer(self.service_config.socket_path, handler)
+        return ThreadingHTTPServer((self.service_config.host, self.service_config.port), handler)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    """
+    GET  /health         service and queue status
+    GET  /targets        loaded targets and their intervals
+    GET  /jobs/<job_id>  job status
+    POST /jobs           {"targets": [names]} profiles the given targets (all when omitted)
+    POST /reload         re-reads the targets file
+    """
+
+    service: ProfilingService
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send(HTTPStatus.OK, self.service.status())
+        elif self.path == "/targets":
+            targets = [
+                {"name": target.target_name, "type": target.type, "interval_seconds": self.service._interval(target)}
+                for target in self.service.targets
+            ]
+            self._send(HTTPStatus.OK, {"targets": targets})
+        elif self.path.startswith("/jobs/"):
+            job = self.service.get_job(self.path[len("/jobs/"):])
+            if job is None:
+                self._send(HTTPStatus.NOT_FOUND, {"error": "Unknown job."})
+            else:
+                self._send(HTTPStatus.OK, asdict(job))
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:
+        try:
+            body = self._read_json()
+            if self.path == "/jobs":
+                names = body.get("targets")
+                if names is not None and not isinstance(names, list):
+                    raise ValueError("'targets' must be a list of target names.")
+                job = self.service.submit(names)
+                self._send(HTTPStatus.ACCEPTED, asdict(job))
+            elif self.path == "/reload":
+                targets = self.service.reload_targets()
+                self._send(HTTPStatus.OK, {"targets": len(targets)})
+            else:
+                self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {self.path}"})
+        except QueueFullError as exc:
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(exc)}, headers={"Retry-After": "5"})
+        except UnknownTargetError as exc:
+            self._send(HTTPStatus.NOT_FOUND, {"error": str(exc)})
+        except (ValueError, FileNotFoundError) as exc:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length == 0:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length).decode("utf-8"))
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON body: {exc}") from exc
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object.")
+        return body
+
+    def _send(self, status: HTTPStatus, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) and self.client_address else "local"
@@ -0,0 +1,32 @@
+from typing import Optional, Type
+
+import pytest
+
+from profiler.connectors.base import DatabaseConnector
+
+
+class FakeConnector(DatabaseConnector):
+    """Serves `sample_rows` synthetic rows per query; raises on queries containing `fail_on`."""
+
+    connects = 0
+
+    def __init__(self, fail_on: Optional[str] = None) -> None:
+        super().__init__(connection_string="")
+        self.fail_on = fail_on
+        self.queries: list[str] = []
+
+    def connect(self) -> None:
+        type(self).connects += 1
+        self._conn = None
+
+    def sample_data(self, base_sql: str, sample_rows: int):
+        self.queries.append(base_sql)
+        if self.fail_on and self.fail_on in base_sql:
+            raise RuntimeError("connection dropped")
+        return [{"Id": i, "Name": f"n{i}", "Amount": float(i)} for i in range(sample_rows)]
+
+
+@pytest.fixture
+def fake_connector() -> Type[FakeConnector]:
+    """A fresh `FakeConnector` subclass, so `connects` counts only this test's connections."""
+    return type("FakeConnector", (FakeConnector,), {"connects": 0})
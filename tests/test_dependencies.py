@@ -0,0 +1,54 @@
+import pandas as pd
+
+from profiler.config import DependenciesConfig
+from profiler.profiling.dependencies import DependencyAnalyzer
+
+
+def test_dependency_analyzer_finds_minimal_keys_and_dependencies():
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4, 5, 6],
+            "country": ["AR", "AR", "UY", "UY", "CL", "CL"],
+            "region": ["SA", "SA", "SA", "SA", None, None],
+            "year": [2023, 2024, 2023, 2024, 2023, 2024],
+            "source": ["x", "x", "x", "x", "x", "x"],
+        }
+    )
+    result = DependencyAnalyzer(DependenciesConfig(enabled=True, max_width=2)).detect(df, "t1")
+
+    keys = set(result.loc[result["kind"] == "candidate_key", "lhs"])
+    assert keys == {"id", "country, year"}
+
+    fd_rows = result[result["kind"] == "functional_dependency"]
+    fds = set(zip(fd_rows["lhs"], fd_rows["rhs"]))
+    assert ("country", "region") in fds
+    # region is implied by country alone, so wider determinants are not reported
+    assert not any(rhs == "region" and "," in lhs for lhs, rhs in fds)
+    assert result["search_complete"].all()
+
+
+def test_dependency_analyzer_respects_time_budget():
+    df = pd.DataFrame({"id": [1, 2, 3], "a": [1, 1, 2], "b": [1, 2, 2]})
+    result = DependencyAnalyzer(DependenciesConfig(enabled=True, time_budget_seconds=0)).detect(df, "t1")
+
+    # single-column keys come straight from the column encodings; the combination search is cut short
+    assert list(result["lhs"]) == ["id"]
+    assert not result["search_complete"].any()
+
+
+def test_dependency_analyzer_does_not_report_nullable_keys():
+    df = pd.DataFrame(
+        {
+            "mixed": [1, "a", None, 4],
+            "seen_at": pd.to_datetime(["2024-01-01", None, "2024-01-03", "2024-01-04"]),
+            "group": ["x", "x", "y", "y"],
+            "code": [1, 2, 1, None],
+        }
+    )
+    result = DependencyAnalyzer(DependenciesConfig(enabled=True, max_width=2)).detect(df, "t1")
+
+    keys = set(result.loc[result["kind"] == "candidate_key", "lhs"])
+    assert "mixed" not in keys
+    assert "seen_at" not in keys
+    # unique as a pair, but code holds a NULL
+    assert "group, code" not in keys
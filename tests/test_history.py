@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import pandas as pd
+
+from profiler.reporting.history import HistoryStore
+
+
+def _column_profile(null_ratio: float, distinct_count: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "target_name": "dbo.Customer",
+                "column_name": "Email",
+                "null_count": int(null_ratio * 100),
+                "null_ratio": null_ratio,
+                "distinct_count": distinct_count,
+                "min_date": pd.NaT,
+            },
+            {
+                "target_name": "dbo.Customer",
+                "column_name": "Segment",
+                "null_count": 0,
+                "null_ratio": 0.0,
+                "distinct_count": 4,
+                "min_date": pd.Timestamp("2024-01-01"),
+            },
+        ]
+    )
+
+
+def test_history_series_and_compare(tmp_path: Path):
+    table_df = pd.DataFrame([{"target_name": "dbo.Customer", "row_count_sample": 100, "column_count": 2}])
+
+    with HistoryStore(tmp_path / "history.db") as store:
+        store.record("r1", "2024-01-01T00:00:00+00:00", table_df, _column_profile(0.0, 100))
+        store.record("r2", "2024-01-02T00:00:00+00:00", table_df, _column_profile(0.3, 10))
+
+        runs = store.list_runs()
+        assert list(runs["run_id"]) == ["r1", "r2"]
+
+        series = store.metric_series("dbo.Customer", "null_ratio", column_name="Email")
+        assert list(series["value"]) == [0.0, 0.3]
+
+        rows = store.metric_series("dbo.Customer", "row_count_sample")
+        assert list(rows["value"]) == [100.0, 100.0]
+
+        dates = store.metric_series("dbo.Customer", "min_date", column_name="Segment")
+        assert dates["value_text"].iloc[0].startswith("2024-01-01")
+
+        diff = store.compare_runs("r1", "r2").set_index("column_name")
+        assert bool(diff.loc["Email", "null_ratio_jump"])
+        assert bool(diff.loc["Email", "distinct_collapse"])
+        assert not bool(diff.loc["Segment", "null_ratio_jump"])
+        assert not bool(diff.loc["Segment", "distinct_collapse"])
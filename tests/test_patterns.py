@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+
+from profiler.config import PatternsConfig
+from profiler.profiling import patterns as patterns_module
+from profiler.profiling.metrics import MetricsCalculator
+from profiler.profiling.patterns import PatternProfiler, shape_patterns, to_string_series
+
+
+def test_shape_patterns_collapse_character_classes():
+    strings = to_string_series(pd.Series(["AB-1234", "Hello World", "x9", "ab_cd"]))
+    assert list(shape_patterns(strings, max_length=64)) == ["A-9", "Aa Aa", "a9", "a_a"]
+    assert list(shape_patterns(strings, max_length=4)) == ["A-9", "Aa", "a9", "a_a"]
+
+
+def test_shape_patterns_classify_accented_letters():
+    values = ["José Müller", "ÁÉ-12", "Ñandú", "JOSÉ"]
+    expected = ["Aa Aa", "A-9", "Aa", "A"]
+
+    assert list(shape_patterns(to_string_series(pd.Series(values)), max_length=64)) == expected
+    with pytest.raises(ValueError, match="Arrow"):
+        shape_patterns(pd.Series(values, dtype=pd.StringDtype("python")), max_length=64)
+
+
+def test_string_profiling_is_skipped_without_pyarrow(monkeypatch):
+    monkeypatch.setattr(patterns_module, "arrow_strings_available", lambda: False)
+    df = pd.DataFrame({"code": ["AB-1", "CD-2"]})
+
+    with pytest.warns(RuntimeWarning, match="pyarrow"):
+        result = PatternProfiler(PatternsConfig()).detect(df, "t1")
+    assert result.empty
+    with pytest.warns(RuntimeWarning, match="pyarrow"):
+        calculator = MetricsCalculator()
+    assert not calculator.format_ratios
+
+
+def test_pattern_profiler_bounds_pattern_table():
+    df = pd.DataFrame(
+        {
+            "code": ["AB-1", "CD-2", "EF-3", "x", None],
+            "num": [1, 2, 3, 4, 5],
+        }
+    )
+    patterns = PatternProfiler(PatternsConfig(max_patterns=1)).detect(df, "t1")
+
+    assert list(patterns["column_name"]) == ["code"]
+    row = patterns.iloc[0]
+    assert row["pattern"] == "A-9"
+    assert row["count"] == 3
+    assert row["ratio"] == 0.75
+
+
+def test_string_metrics_report_format_ratios():
+    df = pd.DataFrame(
+        {
+            "mixed": [
+                "42",
+                "2024-01-31",
+                "someone@example.com",
+                "3F2504E0-4F89-11D3-9A0C-0305E82C3301",
+                "plain text",
+            ]
+        }
+    )
+    row = MetricsCalculator().compute_column_metrics(df, "t1").iloc[0]
+
+    assert row["numeric_text_ratio"] == 0.2
+    assert row["date_ratio"] == 0.2
+    assert row["email_ratio"] == 0.2
+    assert row["guid_ratio"] == 0.2
+    assert row["max_length"] == 36
+
+
+def test_format_ratios_count_only_ascii_digits():
+    # Arabic-Indic digits are Unicode digits but not numbers the database would parse
+    row = MetricsCalculator().compute_column_metrics(pd.DataFrame({"code": ["42", "٤٢"]}), "t1").iloc[0]
+
+    assert row["numeric_text_ratio"] == 0.5
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from profiler.profiling.pipeline import Prefetcher
+
+
+def _tracked(count: int, produced: list, fail_at: int | None = None):
+    for index in range(count):
+        if index == fail_at:
+            raise RuntimeError("fetch failed")
+        produced.append(index)
+        yield index
+
+
+def _wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # give an unbounded producer the chance to run ahead
+    time.sleep(0.05)
+
+
+def test_prefetcher_preserves_order_and_bounds_depth():
+    produced: list = []
+    prefetcher = Prefetcher(_tracked(10, produced), depth=2)
+
+    _wait_for(lambda: len(produced) >= 3)
+    # two buffered items plus the one waiting for room
+    assert len(produced) == 3
+    assert list(prefetcher) == list(range(10))
+    prefetcher.close()
+
+
+def test_prefetcher_respects_memory_ceiling():
+    produced: list = []
+    prefetcher = Prefetcher(_tracked(10, produced), depth=5, max_bytes=250, size_of=lambda item: 100)
+
+    _wait_for(lambda: len(produced) >= 3)
+    assert len(produced) == 3
+    prefetcher.close()
+
+
+def test_prefetcher_reraises_producer_errors_after_buffered_items():
+    consumed = []
+    prefetcher = Prefetcher(_tracked(5, [], fail_at=3), depth=4)
+
+    with pytest.raises(RuntimeError, match="fetch failed"):
+        for item in prefetcher:
+            consumed.append(item)
+    assert consumed == [0, 1, 2]
+    prefetcher.close()
@@ -0,0 +1,281 @@
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from profiler.config import Config
+from profiler.connectors.base import DatabaseConnector
+from profiler.profiling.profiler import Profiler
+from profiler.reporting.checkpoint import ResultWriter, RunManifest
+from profiler.reporting.history import HistoryStore
+
+
+def _write_targets(tmp_path: Path) -> Path:
+    targets = {
+        "targets": [
+            {"type": "table", "schema": "dbo", "table": "Customer", "sample_rows": 5},
+            {"type": "table", "schema": "dbo", "table": "Orders", "sample_rows": 5},
+            {"type": "table", "schema": "dbo", "table": "Product", "sample_rows": 5},
+        ]
+    }
+    path = tmp_path / "targets.json"
+    path.write_text(json.dumps(targets), encoding="utf-8")
+    return path
+
+
+def _profiler(config: Config, connector: DatabaseConnector) -> Profiler:
+    profiler = Profiler(config)
+    profiler.connector = connector
+    return profiler
+
+
+def test_run_checkpoints_targets_and_resumes_after_failure(tmp_path: Path, fake_connector):
+    outdir = tmp_path / "out"
+    config = Config(
+        engine="sqlserver",
+        connection_string="",
+        targets_file=str(_write_targets(tmp_path)),
+        outdir=str(outdir),
+    )
+
+    with pytest.raises(RuntimeError):
+        _profiler(config, fake_connector(fail_on="dbo.Orders")).run()
+
+    manifest = RunManifest.load(outdir)
+    assert manifest.status == "failed"
+    assert list(manifest.completed.values()) == ["dbo.Customer"]
+    assert list(pd.read_csv(outdir / "table_profile.csv")["target_name"]) == ["dbo.Customer"]
+
+    config.resume = True
+    connector = fake_connector()
+    results = _profiler(config, connector).run()
+
+    assert not any("dbo.Customer" in sql for sql in connector.queries)
+    assert list(results.table_profile["target_name"]) == ["dbo.Orders", "dbo.Product"]
+    assert results.run_id == manifest.run_id
+
+    resumed = RunManifest.load(outdir)
+    assert resumed.status == "completed"
+    assert len(resumed.completed) == 3
+    table_profile = pd.read_csv(outdir / "table_profile.csv")
+    assert list(table_profile["target_name"]) == ["dbo.Customer", "dbo.Orders", "dbo.Product"]
+    assert len(pd.read_csv(outdir / "column_profile.csv")) == 9
+
+
+@pytest.mark.parametrize("output_format", ["csv", "jsonl"])
+def test_resume_drops_rows_written_before_a_crash_in_the_commit_window(
+    tmp_path: Path, monkeypatch, output_format, fake_connector
+):
+    outdir = tmp_path / "out"
+    config = Config(
+        engine="sqlserver",
+        connection_string="",
+        targets_file=str(_write_targets(tmp_path)),
+        outdir=str(outdir),
+        output_format=output_format,
+        history_db=str(tmp_path / "history.db"),
+    )
+    write = ResultWriter.write
+
+    def write_then_crash(self, frames):
+        write(self, frames)
+        if frames["table_profile"]["target_name"].iloc[0] == "dbo.Orders":
+            raise RuntimeError("killed before the manifest save")
+
+    monkeypatch.setattr(ResultWriter, "write", write_then_crash)
+    with pytest.raises(RuntimeError):
+        _profiler(config, fake_connector()).run()
+    monkeypatch.setattr(ResultWriter, "write", write)
+
+    assert list(RunManifest.load(outdir).completed.values()) == ["dbo.Customer"]
+
+    config.resume = True
+    _profiler(config, fake_connector()).run()
+
+    if output_format == "csv":
+        table_profile = pd.read_csv(outdir / "table_profile.csv")
+        column_profile = pd.read_csv(outdir / "column_profile.csv")
+    else:
+        table_profile = pd.read_json(outdir / "table_profile.jsonl", lines=True)
+        column_profile = pd.read_json(outdir / "column_profile.jsonl", lines=True)
+    assert list(table_profile["target_name"]) == ["dbo.Customer", "dbo.Orders", "dbo.Product"]
+    assert len(column_profile) == 9
+
+    # the target recorded before the crash is replaced, not duplicated, in the history
+    with HistoryStore(tmp_path / "history.db") as store:
+        series = store.metric_series("dbo.Orders", "row_count_sample")
+    assert len(series) == 1
+
+
+def test_history_failure_leaves_target_uncommitted(tmp_path: Path, monkeypatch, fake_connector):
+    outdir = tmp_path / "out"
+    config = Config(
+        engine="sqlserver",
+        connection_string="",
+        targets_file=str(_write_targets(tmp_path)),
+        outdir=str(outdir),
+        history_db=str(tmp_path / "history.db"),
+    )
+    record = HistoryStore.record
+
+    def record_then_fail(self, run_id, run_ts, table_profile, *args, **kwargs):
+        if table_profile["target_name"].iloc[0] == "dbo.Orders":
+            raise RuntimeError("database is locked")
+        record(self, run_id, run_ts, table_profile, *args, **kwargs)
+
+    monkeypatch.setattr(HistoryStore, "record", record_then_fail)
+    with pytest.raises(RuntimeError):
+        _profiler(config, fake_connector()).run()
+    monkeypatch.setattr(HistoryStore, "record", record)
+
+    assert list(pd.read_csv(outdir / "table_profile.csv")["target_name"]) == ["dbo.Customer"]
+
+    config.resume = True
+    _profiler(config, fake_connector()).run()
+
+    table_profile = pd.read_csv(outdir / "table_profile.csv")
+    assert list(table_profile["target_name"]) == ["dbo.Customer", "dbo.Orders", "dbo.Product"]
+
+
+def test_fresh_run_replaces_previous_outputs(tmp_path: Path, fake_connector):
+    outdir = tmp_path / "out"
+    config = Config(
+        engine="sqlserver",
+        connection_string="",
+        targets_file=str(_write_targets(tmp_path)),
+        outdir=str(outdir),
+        output_format="jsonl",
+    )
+
+    _profiler(config, fake_connector()).run()
+    _profiler(config, fake_connector()).run()
+
+    lines = (outdir / "table_profile.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+
+
+def test_parquet_parts_of_different_targets_read_back_as_one_dataset(tmp_path: Path, fake_connector):
+    class DatedConnector(fake_connector):
+        def sample_data(self, base_sql: str, sample_rows: int):
+            rows = super().sample_data(base_sql, sample_rows)
+            if "dbo.Orders" in base_sql:
+                for i, row in enumerate(rows):
+                    row["CreatedAt"] = pd.Timestamp("2024-01-01") + pd.Timedelta(days=i)
+            return rows
+
+    outdir = tmp_path / "out"
+    config = Config(
+        engine="sqlserver",
+        connection_string="",
+        targets_file=str(_write_targets(tmp_path)),
+        outdir=str(outdir),
+        output_format="parquet",
+    )
+    _profiler(config, DatedConnector()).run()
+
+    column_profile = pd.read_parquet(outdir / "column_profile")
+    assert len(column_profile) == 10
+    dated = column_profile[column_profile["column_name"] == "CreatedAt"].iloc[0]
+    assert dated["max_date"] == pd.Timestamp("2024-01-05")
+    assert column_profile["min_date"].isna().sum() == 9
+    table_profile = pd.read_parquet(outdir / "table_profile")
+    assert list(table_profile["target_name"]) == ["dbo.Customer", "dbo.Orders", "dbo.Product"]
+
+
+def test_fresh_run_only_removes_its_own_outputs(tmp_path: Path, fake_connector):
+    outdir = tmp_path / "out"
+    config = Config(
+        engine="sqlserver",
+        connection_string="",
+        targets_file=str(_write_targets(tmp_path)),
+        outdir=str(outdir),
+        output_format="parquet",
+    )
+    _profiler(config, fake_connector()).run()
+    (outdir / "outliers").mkdir(exist_ok=True)
+    (outdir / "outliers" / "notes.txt").write_text("keep me", encoding="utf-8")
+
+    # an invalid targets file fails before anything is reset
+    broken = replace(config, targets_file=str(tmp_path / "missing.json"))
+    with pytest.raises(FileNotFoundError):
+        _profiler(broken, fake_connector()).run()
+    assert len(list((outdir / "table_profile").glob("part-*.parquet"))) == 3
+
+    _profiler(config, fake_connector()).run()
+    assert len(list((outdir / "table_profile").glob("part-*.parquet"))) == 3
+    assert (outdir / "outliers" / "notes.txt").read_text(encoding="utf-8") == "keep me"
+
+
+def test_targets_on_the_same_table_share_one_scan(tmp_path: Path, fake_connector):
+    targets = {
+        "targets": [
+            {"type": "table", "schema": "dbo", "table": "Customer", "where": "Region = 'N'", "name": "north"},
+            {"type": "table", "schema": "dbo", "table": "Customer", "where": "Region = 'S'", "name": "south"},
+        ]
+    }
+    targets_file = tmp_path / "targets.json"
+    targets_file.write_text(json.dumps(targets), encoding="utf-8")
+
+    class TaggingConnector(fake_connector):
+        def sample_data(self, base_sql: str, sample_rows: int):
+            self.queries.append(base_sql)
+            return [{"Id": i, "pf_tag_0": i % 2, "pf_tag_1": 1 - i % 2} for i in range(5)]
+
+    connector = TaggingConnector()
+    config = Config(
+        engine="sqlserver",
+        connection_string="",
+        targets_file=str(targets_file),
+        sample_rows=10,
+        shared_scans=True,
+    )
+    results = _profiler(config, connector).run()
+
+    assert len(connector.queries) == 1
+    assert list(results.table_profile["row_count_sample"]) == [2, 3]
+    assert list(results.table_profile["column_count"]) == [1, 1]
+
+
+def test_skewed_filters_fall_back_to_separate_scans(tmp_path: Path, fake_connector):
+    regions = ["N", "S", "E"]
+    targets = {
+        "targets": [
+            {"type": "table", "schema": "dbo", "table": "Customer", "where": f"Region = '{region}'", "name": region}
+            for region in regions
+        ]
+    }
+    targets_file = tmp_path / "targets.json"
+    targets_file.write_text(json.dumps(targets), encoding="utf-8")
+
+    class SkewedConnector(fake_connector):
+        """Northern rows dominate the table, so the shared scan fills up with them alone."""
+
+        fetched = 0
+
+        def sample_data(self, base_sql: str, sample_rows: int):
+            self.queries.append(base_sql)
+            self.fetched += sample_rows
+            if "pf_tag_" in base_sql:
+                return [{"Id": i, "pf_tag_0": 1, "pf_tag_1": 0, "pf_tag_2": 0} for i in range(sample_rows)]
+            return [{"Id": i} for i in range(sample_rows)]
+
+    connector = SkewedConnector()
+    config = Config(
+        engine="sqlserver",
+        connection_string="",
+        targets_file=str(targets_file),
+        sample_rows=4,
+        shared_scans=True,
+    )
+    results = _profiler(config, connector).run()
+
+    assert list(results.table_profile["row_count_sample"]) == [4, 4, 4]
+    # the shared scan plus one refetch per under-filled target: (2k - 1) * N rows instead of k * N
+    assert len(connector.queries) == 3
+    assert connector.fetched == (2 * len(regions) - 1) * 4
+
+    connector = SkewedConnector()
+    _profiler(replace(config, shared_scans=False), connector).run()
+    assert connector.fetched == len(regions) * 4
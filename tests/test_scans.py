@@ -0,0 +1,71 @@
+import pandas as pd
+
+from profiler.profiling.scans import build_shared_sql, plan_scans, split_shared_frame
+from profiler.profiling.targets import ProfileTarget
+
+
+def _targets():
+    return [
+        ProfileTarget(type="table", schema="dbo", table="Customer", where="Region = 'N'", sample_rows=2),
+        ProfileTarget(type="query", sql="SELECT 1 AS x", name="q"),
+        ProfileTarget(type="table", schema="DBO", table="customer", where="Region = 'S'", sample_rows=2),
+        ProfileTarget(type="table", schema="dbo", table="Orders"),
+    ]
+
+
+def test_plan_scans_groups_targets_on_the_same_table():
+    groups = plan_scans(_targets(), default_sample_rows=10)
+
+    assert [len(group.targets) for group in groups] == [2, 1, 1]
+    assert groups[0].shared
+    assert groups[0].total_sample_rows == 4
+    assert groups[2].sample_rows == [10]
+
+    unshared = plan_scans(_targets(), default_sample_rows=10, shared=False)
+    assert len(unshared) == 4
+
+
+def test_plan_scans_keeps_unfiltered_targets_out_of_shared_groups():
+    targets = [
+        ProfileTarget(type="table", schema="dbo", table="Customer", where="Region = 'N'", name="north"),
+        ProfileTarget(type="table", schema="dbo", table="Customer", name="all"),
+        ProfileTarget(type="table", schema="dbo", table="Customer", where="Region = 'S'", name="south"),
+    ]
+    groups = plan_scans(targets, default_sample_rows=10)
+
+    assert [[target.name for target in group.targets] for group in groups] == [["north", "south"], ["all"]]
+    assert build_shared_sql(groups[0]).endswith("WHERE (Region = 'N') OR (Region = 'S')")
+    assert not groups[1].shared
+
+
+def test_build_shared_sql_tags_each_filter():
+    group = plan_scans(_targets(), default_sample_rows=10)[0]
+    sql = build_shared_sql(group)
+
+    assert sql == (
+        "SELECT t.*, CASE WHEN (Region = 'N') THEN 1 ELSE 0 END AS pf_tag_0, "
+        "CASE WHEN (Region = 'S') THEN 1 ELSE 0 END AS pf_tag_1 "
+        "FROM dbo.Customer t WHERE (Region = 'N') OR (Region = 'S')"
+    )
+
+
+def test_split_shared_frame_caps_samples_and_flags_shortfalls():
+    group = plan_scans(_targets(), default_sample_rows=10)[0]
+    scan = pd.DataFrame(
+        {
+            "Id": [1, 2, 3, 4],
+            "Region": ["N", "N", "N", "S"],
+            "PF_TAG_0": [1, 1, 1, 0],
+            "PF_TAG_1": [0, 0, 0, 1],
+        }
+    )
+
+    north, south = split_shared_frame(group, scan)
+    assert list(north["Id"]) == [1, 2]
+    assert list(north.columns) == ["Id", "Region"]
+    # the scan hit its 4-row limit with only one southern row: fetch that target on its own
+    assert south is None
+
+    north, south = split_shared_frame(group, scan.iloc[[0, 3]])
+    assert list(north["Id"]) == [1]
+    assert list(south["Id"]) == [4]
@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from profiler.cli import parse_serve_args
+from profiler.config import Config, ServiceConfig
+from profiler.service import ProfilingService, QueueFullError
+
+
+def _config(tmp_path: Path) -> Config:
+    targets = {
+        "targets": [
+            {"type": "table", "schema": "dbo", "table": "Customer", "interval_seconds": 60},
+            {"type": "query", "name": "Orders", "sql": "SELECT * FROM dbo.Orders"},
+        ]
+    }
+    targets_file = tmp_path / "targets.json"
+    targets_file.write_text(json.dumps(targets), encoding="utf-8")
+    return Config(engine="sqlserver", connection_string="", targets_file=str(targets_file), sample_rows=3)
+
+
+def _request(url: str, method: str = "GET", body: dict | None = None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_service_runs_jobs_over_http_with_warm_connections(tmp_path: Path, fake_connector):
+    service = ProfilingService(_config(tmp_path), ServiceConfig(port=0, workers=1), connector_factory=fake_connector)
+    service.start()
+    server = service._build_server()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        job_ids = []
+        for _ in range(2):
+            status, job = _request(f"{base_url}/jobs", "POST", {"targets": ["Orders"]})
+            assert status == 202
+            job_ids.append(job["job_id"])
+
+        for job_id in job_ids:
+            deadline = time.monotonic() + 5
+            while True:
+                status, job = _request(f"{base_url}/jobs/{job_id}")
+                if job["status"] in ("completed", "failed") or time.monotonic() > deadline:
+                    break
+                time.sleep(0.05)
+            assert job["status"] == "completed", job
+        assert fake_connector.connects == 1
+
+        status, payload = _request(f"{base_url}/jobs", "POST", {"targets": ["missing"]})
+        assert status == 404
+        status, payload = _request(f"{base_url}/jobs", "POST", {"targets": [["Orders"]]})
+        assert status == 400
+        status, payload = _request(f"{base_url}/health")
+        assert payload["jobs"]["completed"] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop()
+
+
+def test_service_rejects_jobs_when_queue_is_full_and_schedules_due_targets(tmp_path: Path, fake_connector):
+    service = ProfilingService(_config(tmp_path), ServiceConfig(workers=1, queue_size=1), connector_factory=fake_connector)
+
+    scheduled = service.schedule_due(now=0.0)
+    assert [job.targets for job in scheduled] == [["dbo.Customer"]]
+    # already queued, and not due again until its interval has passed
+    assert service.schedule_due(now=30.0) == []
+
+    with pytest.raises(QueueFullError):
+        service.submit(["Orders"])
+
+
+def test_failed_reload_keeps_previous_targets(tmp_path: Path, fake_connector):
+    config = _config(tmp_path)
+    service = ProfilingService(config, ServiceConfig(workers=1), connector_factory=fake_connector)
+    Path(config.targets_file).write_text(
+        json.dumps({"targets": [{"type": "table", "schema": "dbo", "table": "Orders", "interval_seconds": "soon"}]}),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="interval_seconds"):
+        service.reload_targets()
+    assert [target.target_name for target in service.targets] == ["dbo.Customer", "Orders"]
+    assert [job.targets for job in service.schedule_due(now=0.0)] == [["dbo.Customer"]]
+
+
+@pytest.mark.parametrize("service_config", [ServiceConfig(queue_size=0), ServiceConfig(workers=0)])
+def test_service_rejects_unbounded_queue_and_missing_workers(tmp_path: Path, fake_connector, service_config):
+    with pytest.raises(ValueError):
+        ProfilingService(_config(tmp_path), service_config, connector_factory=fake_connector)
+
+
+def test_serve_does_not_accept_resume():
+    argv = ["--engine", "sqlserver", "--connstr", "", "--targets-file", "targets.json"]
+    assert parse_serve_args(argv).resume is False
+    with pytest.raises(SystemExit):
+        parse_serve_args([*argv, "--resume"])
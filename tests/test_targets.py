@@ -1,6 +1,8 @@
 import json
 from pathlib import Path
 
+import pytest
+
 from profiler.profiling.targets import TargetLoader
 
 
@@ -25,3 +27,15 @@ def test_target_loader_parses_table_and_query(tmp_path: Path):
     assert targets[0].target_name == "dbo.Customer"
     assert targets[1].type == "query"
     assert targets[1].sample_rows == 50
+
+
+@pytest.mark.parametrize("interval", [0, -5, "60", True])
+def test_target_loader_rejects_invalid_interval(tmp_path: Path, interval):
+    target_file = tmp_path / "targets.json"
+    target_file.write_text(
+        json.dumps({"targets": [{"type": "table", "schema": "dbo", "table": "Customer", "interval_seconds": interval}]}),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="interval_seconds"):
+        TargetLoader.from_json_file(target_file)